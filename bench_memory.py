@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: compact food model vs the plain-dict shape
+Run with: python bench_memory.py [--foods 5000]
+
+Builds synthetic FDC-shaped search hits and food documents, then measures
+with tracemalloc how much memory holding them costs as dicts (the shape the
+tools used to cache) versus SearchHit / FoodRecord.
+"""
+
+import argparse
+import random
+import tracemalloc
+from food_model import FoodRecord, SearchHit
+
+DATA_TYPES = ["Foundation", "SR Legacy", "Survey (FNDDS)", "Branded"]
+NUTRIENTS = [f"Nutrient {i}" for i in range(150)] + [
+    "Energy",
+    "Protein",
+    "Carbohydrate, by difference",
+    "Total lipid (fat)",
+    "Fiber, total dietary",
+    "Sugars, total including NLEA",
+]
+PORTIONS = ["1 cup", "1 tbsp", "1 medium", "1 slice", "1 piece", "1 oz"]
+
+
+def _fresh(text: str) -> str:
+    # JSON decoding gives every record its own string objects
+    return "".join(list(text))
+
+
+def make_foods(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    brands = [f"Brand Owner {i} Inc." for i in range(count // 10 + 1)]
+    foods = []
+    for fdc_id in range(100000, 100000 + count):
+        foods.append(
+            {
+                "fdcId": fdc_id,
+                "description": f"Food item {fdc_id}, raw",
+                "dataType": _fresh(rng.choice(DATA_TYPES)),
+                "brandOwner": _fresh(rng.choice(brands)),
+                "ingredients": ", ".join(
+                    rng.choice(["SUGAR", "SALT", "WATER", "SOY", "WHEAT FLOUR"])
+                    for _ in range(40)
+                ),
+                "updated": "2024-04-18",
+                "foodNutrients": [
+                    {
+                        "nutrient": {"name": _fresh(name)},
+                        "amount": round(rng.uniform(0, 500), 2),
+                    }
+                    for name in rng.sample(NUTRIENTS, 60)
+                ],
+                "foodPortions": [
+                    {
+                        "portionDescription": _fresh(desc),
+                        "gramWeight": rng.choice([15, 28, 30, 150, 240]),
+                    }
+                    for desc in rng.sample(PORTIONS, 3)
+                ],
+            }
+        )
+    return foods
+
+
+def measure(build) -> int:
+    """Bytes still allocated after build() returns its result"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark food model memory")
+    parser.add_argument("--foods", type=int, default=5000)
+    args = parser.parse_args()
+
+    def hit_dicts():
+        return [
+            {
+                "fdcId": f["fdcId"],
+                "description": _fresh(f["description"]),
+                "dataType": _fresh(f["dataType"]),
+                "brandOwner": _fresh(f["brandOwner"]),
+                "ingredients": _fresh(f["ingredients"]),
+            }
+            for f in make_foods(args.foods)
+        ]
+
+    def hit_records():
+        return [SearchHit.from_dict(f) for f in make_foods(args.foods)]
+
+    def food_records():
+        return [FoodRecord.from_dict(f) for f in make_foods(args.foods)]
+
+    rows = [
+        ("search hits", measure(hit_dicts), measure(hit_records)),
+        ("foods", measure(lambda: make_foods(args.foods)), measure(food_records)),
+    ]
+
+    print(f"📦 Memory for {args.foods} foods (dict shape vs compact model)")
+    for label, as_dicts, compact in rows:
+        print(
+            f"  {label:<12} dicts: {as_dicts / 1e6:7.1f} MB  "
+            f"compact: {compact / 1e6:7.1f} MB  "
+            f"({as_dicts / args.foods:6.0f} -> {compact / args.foods:5.0f} B/food, "
+            f"{as_dicts / compact:.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
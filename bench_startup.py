@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Nutrition MCP Server
+Run with: USDA_API_KEY=your_key_here python bench_startup.py [--runs 5]
+
+Reports, per run and as a median:
+  import    - time to import main.py in a fresh interpreter
+  ready     - spawn to `initialize` response
+  list      - `tools/list` round trip
+  first     - first `tools/call` round trip (warm if NUTRITION_SNAPSHOT_PATH
+              points at a snapshot containing the query; with
+              NUTRITION_STORE_PATH set it includes waiting for the store load)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import() -> float:
+    """Seconds to import main.py in a fresh interpreter"""
+    code = (
+        "import time; t = time.perf_counter(); import main; "
+        "print(time.perf_counter() - t)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip())
+
+
+def _request(proc, message_id: int, method: str, params: dict = None) -> dict:
+    message = {"jsonrpc": "2.0", "id": message_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Server exited while waiting for {method}")
+        response = json.loads(line)
+        if response.get("id") == message_id:
+            return response
+
+
+def measure_session(query: str) -> dict:
+    """Spawn main.py and time initialize, tools/list and a first tools/call"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "main.py")],
+        cwd=HERE,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        _request(
+            proc,
+            1,
+            "initialize",
+            {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "1.0.0"},
+            },
+        )
+        ready = time.perf_counter() - start
+        proc.stdin.write(
+            json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            + "\n"
+        )
+        proc.stdin.flush()
+
+        t = time.perf_counter()
+        _request(proc, 2, "tools/list")
+        list_latency = time.perf_counter() - t
+
+        t = time.perf_counter()
+        _request(
+            proc,
+            3,
+            "tools/call",
+            {"name": "search_food_items", "arguments": {"query": query}},
+        )
+        first = time.perf_counter() - t
+    finally:
+        # Closing stdin shuts the server down cleanly (and saves the snapshot)
+        proc.stdin.close()
+        proc.wait(timeout=10)
+
+    return {"ready": ready, "list": list_latency, "first": first}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--query", default="tofu")
+    args = parser.parse_args()
+
+    if not os.getenv("USDA_API_KEY"):
+        print("ERROR: USDA_API_KEY environment variable required", file=sys.stderr)
+        sys.exit(1)
+
+    snapshot = os.getenv("NUTRITION_SNAPSHOT_PATH")
+    store = os.getenv("NUTRITION_STORE_PATH")
+    print(
+        f"⏱️  Startup benchmark ({args.runs} runs, snapshot: {snapshot or 'off'}, "
+        f"store: {store or 'off'})"
+    )
+
+    results = []
+    for run in range(1, args.runs + 1):
+        result = {"import": measure_import(), **measure_session(args.query)}
+        results.append(result)
+        print(
+            f"  run {run}: "
+            + "  ".join(f"{k}={v * 1000:.0f}ms" for k, v in result.items())
+        )
+
+    print(
+        "  median: "
+        + "  ".join(
+            f"{k}={statistics.median(r[k] for r in results) * 1000:.0f}ms"
+            for k in results[0]
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of the local food store against FDC publication dates
+Run with: python fdc_sync.py [--store food_store.json] [--full-scan]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+from typing import Dict, List, Optional, Any
+from food_store import LocalFoodStore, food_updated_date, normalize_fdc_date
+from usda_api import USDAApi
+
+DEFAULT_DATA_TYPES = ["Foundation", "SR Legacy", "Survey (FNDDS)"]
+
+
+class IncrementalSync:
+    """
+    Refresh a LocalFoodStore with only the FDC records that changed.
+
+    The FDC list endpoint is walked newest-publication-first. Records that are
+    missing locally or carry a newer publicationDate/modifiedDate than the
+    stored copy are refetched in batches through the /foods endpoint, with a
+    minimum interval between requests to stay under the API rate limit.
+
+    Progress is written to a checkpoint file after every list page, so an
+    interrupted sync resumes at the page (and pending refetches) it stopped on.
+    Each page's refetches are appended to the store's journal before that
+    checkpoint; the store is compacted once, when the pass completes.
+    Once a full pass completes, the newest publicationDate seen becomes the
+    watermark; the next pass stops scanning at the first page published
+    entirely before it that had nothing to refetch.
+
+    FDC cannot sort by modifiedDate, so a record edited after publication
+    (Branded foods) can sit past that stop point, and the abridged list items
+    do not carry modifiedDate at all. With full_scan, which defaults to on
+    when Branded is being synced, every list page is walked and every listed
+    food is fetched in full so its modifiedDate can be compared; only foods
+    that actually changed are stored. That costs one /foods request per
+    batch_size listed foods.
+
+    /foods silently leaves out IDs it cannot serve. Those are recorded in the
+    checkpoint's "unavailable" map with the date they went missing and are
+    not requested again unless the list shows them republished after that.
+    """
+
+    def __init__(
+        self,
+        api: USDAApi,
+        store: LocalFoodStore,
+        checkpoint_path: str,
+        data_types: Optional[List[str]] = None,
+        page_size: int = 200,
+        batch_size: int = 20,
+        min_interval: float = 3.6,
+        full_scan: Optional[bool] = None,
+    ):
+        self.api = api
+        self.store = store
+        self.checkpoint_path = checkpoint_path
+        self.data_types = data_types or DEFAULT_DATA_TYPES
+        self.page_size = page_size
+        self.batch_size = min(batch_size, 20)  # /foods accepts at most 20 IDs
+        self.min_interval = min_interval  # 3.6s ~= 1000 requests/hour
+        if full_scan is None:
+            full_scan = "Branded" in self.data_types
+        self.full_scan = full_scan
+        self._next_request_at = 0.0
+
+    def load_checkpoint(self) -> Dict[str, Any]:
+        if not os.path.exists(self.checkpoint_path):
+            return {"watermark": None, "in_progress": None, "unavailable": {}}
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_checkpoint(self, state: Dict[str, Any]):
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run (or resume) a sync pass and return a short summary"""
+        state = self.load_checkpoint()
+        watermark = state.get("watermark")
+        progress = state.get("in_progress") or {
+            "page_number": 1,
+            "pending_ids": [],
+            "high_water": watermark,
+        }
+        state["in_progress"] = progress
+        state.setdefault("unavailable", {})
+
+        pages = 0
+        refetched = await self._refetch(state)
+
+        while True:
+            page = await self._throttled(
+                self.api.list_foods(
+                    progress["page_number"], self.page_size, self.data_types
+                )
+            )
+            if not page:
+                break
+            pages += 1
+
+            changed = []
+            all_older = True
+            for food in page:
+                # The watermark tracks publication dates, the field we sort by
+                published = normalize_fdc_date(
+                    food.get("publicationDate") or food.get("publishedDate")
+                )
+                if published and (
+                    progress["high_water"] is None or published > progress["high_water"]
+                ):
+                    progress["high_water"] = published
+                if watermark is None or published is None or published >= watermark:
+                    all_older = False
+
+                if self._is_unavailable(state, food["fdcId"], published):
+                    continue
+                # List items lack modifiedDate; a full scan checks full documents
+                if self.full_scan or self._is_changed(food, food_updated_date(food)):
+                    changed.append(food["fdcId"])
+
+            progress["page_number"] += 1
+            progress["pending_ids"] = changed
+            self.save_checkpoint(state)
+            refetched += await self._refetch(state)
+
+            if len(page) < self.page_size:
+                break
+            if all_older and not changed and not self.full_scan:
+                break
+
+        self.store.save()
+        state = {
+            "watermark": progress["high_water"],
+            "in_progress": None,
+            "unavailable": state["unavailable"],
+        }
+        self.save_checkpoint(state)
+
+        return {"pages": pages, "refetched": refetched, "watermark": state["watermark"]}
+
+    def _is_changed(self, food: Dict[str, Any], updated: Optional[str]) -> bool:
+        stored = self.store.get(food["fdcId"])
+        if stored is None:
+            return True
+        if updated is None:
+            return False
+        return stored.updated is None or updated > stored.updated
+
+    @staticmethod
+    def _is_unavailable(
+        state: Dict[str, Any], fdc_id: int, published: Optional[str]
+    ) -> bool:
+        missing_since = state["unavailable"].get(str(fdc_id))
+        if missing_since is None:
+            return False
+        return published is None or published <= missing_since
+
+    async def _refetch(self, state: Dict[str, Any]) -> int:
+        """
+        Fetch the pending IDs in batches and store those that changed, then
+        journal them + checkpoint. Returns the number of foods stored.
+        """
+        pending = state["in_progress"]["pending_ids"]
+        if not pending:
+            return 0
+
+        refetched = 0
+        unavailable = state["unavailable"]
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            foods = await self._throttled(self.api.get_foods(batch))
+            returned = set()
+            for food in foods:
+                returned.add(food["fdcId"])
+                unavailable.pop(str(food["fdcId"]), None)
+                if self._is_changed(food, food_updated_date(food)):
+                    self.store.upsert(food)
+                    refetched += 1
+            for fdc_id in batch:
+                if fdc_id not in returned:
+                    unavailable[str(fdc_id)] = date.today().isoformat()
+
+        # Store first: a crash between the two writes only repeats this page
+        self.store.flush()
+        state["in_progress"]["pending_ids"] = []
+        self.save_checkpoint(state)
+        return refetched
+
+    async def _throttled(self, request):
+        loop = asyncio.get_event_loop()
+        delay = self._next_request_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_request_at = loop.time() + self.min_interval
+        return await request
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--store",
+        default=os.getenv("NUTRITION_STORE_PATH", "food_store.json"),
+        help="Path of the local food store (default: $NUTRITION_STORE_PATH or food_store.json)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Path of the sync checkpoint (default: <store>.sync.json)",
+    )
+    parser.add_argument(
+        "--data-type",
+        action="append",
+        dest="data_types",
+        help="FDC data type to sync; repeat for several (default: non-branded types)",
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        default=None,
+        help="Walk every list page and fetch every food instead of stopping at "
+        "the watermark; needed to catch modifiedDate-only changes "
+        "(default: on for Branded)",
+    )
+    args = parser.parse_args()
+
+    api_key = os.getenv("USDA_API_KEY")
+    if not api_key:
+        print("ERROR: USDA_API_KEY environment variable required", file=sys.stderr)
+        sys.exit(1)
+
+    sync = IncrementalSync(
+        USDAApi(api_key),
+        LocalFoodStore(args.store),
+        args.checkpoint or f"{args.store}.sync.json",
+        data_types=args.data_types,
+        full_scan=args.full_scan,
+    )
+    summary = await sync.run()
+    print(
+        f"✅ Synced {summary['refetched']} foods over {summary['pages']} pages "
+        f"(watermark: {summary['watermark']})",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+"""
+Compact in-memory representation of FDC search hits and food documents
+"""
+
+import sys
+from array import array
+from typing import Dict, List, Optional, Any, Tuple
+
+# Nutrient names are stored once; foods hold indexes into this table
+NUTRIENT_NAMES: List[str] = []
+_NUTRIENT_NAMES_LOWER: List[str] = []
+_NUTRIENT_IDS: Dict[str, int] = {}
+
+
+def nutrient_id(name: str) -> int:
+    """Index of a nutrient name in NUTRIENT_NAMES, registering it if new"""
+    idx = _NUTRIENT_IDS.get(name)
+    if idx is None:
+        idx = len(NUTRIENT_NAMES)
+        NUTRIENT_NAMES.append(sys.intern(name))
+        _NUTRIENT_NAMES_LOWER.append(name.lower())
+        _NUTRIENT_IDS[NUTRIENT_NAMES[idx]] = idx
+    return idx
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Data types and brands repeat across thousands of foods
+    return sys.intern(value) if value else value
+
+
+def _compact_float(value: float) -> float:
+    # float32 columns hold ~7 significant digits; drop the binary noise
+    return float(f"{value:.7g}")
+
+
+class SearchHit:
+    """One food in a search result"""
+
+    __slots__ = ("fdc_id", "description", "data_type", "brand_owner")
+
+    def __init__(
+        self,
+        fdc_id: int,
+        description: str,
+        data_type: Optional[str] = None,
+        brand_owner: Optional[str] = None,
+    ):
+        self.fdc_id = int(fdc_id)
+        self.description = description
+        self.data_type = _intern(data_type)
+        self.brand_owner = _intern(brand_owner)
+
+    @classmethod
+    def from_dict(cls, food: Dict[str, Any]) -> "SearchHit":
+        """Build from an FDC search result item (or to_dict output)"""
+        return cls(
+            food["fdcId"],
+            food.get("description", ""),
+            food.get("dataType"),
+            food.get("brandOwner"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fdcId": self.fdc_id,
+            "description": self.description,
+            "dataType": self.data_type,
+            "brandOwner": self.brand_owner,
+        }
+
+
+class FoodRecord:
+    """
+    Header fields plus nutrient and portion data for one food.
+
+    Nutrients are two parallel columns: array('H') of NUTRIENT_NAMES indexes
+    and array('f') of amounts per 100g. Portions are a tuple of
+    (description, gram weight) pairs.
+    """
+
+    __slots__ = (
+        "fdc_id",
+        "description",
+        "data_type",
+        "brand_owner",
+        "updated",
+        "nutrient_ids",
+        "nutrient_amounts",
+        "portions",
+    )
+
+    def __init__(
+        self,
+        fdc_id: int,
+        description: str,
+        data_type: Optional[str],
+        brand_owner: Optional[str],
+        updated: Optional[str],
+        nutrient_ids: array,
+        nutrient_amounts: array,
+        portions: Tuple[Tuple[str, float], ...],
+    ):
+        self.fdc_id = int(fdc_id)
+        self.description = description
+        self.data_type = _intern(data_type)
+        self.brand_owner = _intern(brand_owner)
+        self.updated = _intern(updated)
+        self.nutrient_ids = nutrient_ids
+        self.nutrient_amounts = nutrient_amounts
+        self.portions = portions
+
+    @classmethod
+    def from_dict(
+        cls, food: Dict[str, Any], updated: Optional[str] = None
+    ) -> "FoodRecord":
+        """Build from a full FDC food document (or to_dict output)"""
+        nutrient_ids = array("H")
+        nutrient_amounts = array("f")
+        for n in food.get("foodNutrients", []):
+            if "nutrient" not in n:
+                continue
+            nutrient_ids.append(nutrient_id(n["nutrient"].get("name", "")))
+            nutrient_amounts.append(n.get("amount") or 0)
+
+        portions = tuple(
+            (_intern(p.get("portionDescription", "")), p.get("gramWeight", 100))
+            for p in food.get("foodPortions", [])
+        )
+
+        return cls(
+            food["fdcId"],
+            food.get("description", ""),
+            food.get("dataType"),
+            food.get("brandOwner"),
+            updated or food.get("updated"),
+            nutrient_ids,
+            nutrient_amounts,
+            portions,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """FDC-shaped dict, as stored on disk and in snapshots"""
+        return {
+            "fdcId": self.fdc_id,
+            "description": self.description,
+            "dataType": self.data_type,
+            "brandOwner": self.brand_owner,
+            "updated": self.updated,
+            "foodNutrients": [
+                {"nutrient": {"name": NUTRIENT_NAMES[idx]}, "amount": _compact_float(a)}
+                for idx, a in zip(self.nutrient_ids, self.nutrient_amounts)
+            ],
+            "foodPortions": self.food_portions(),
+        }
+
+    def nutrient_amount(self, name: str) -> float:
+        """Amount of the first nutrient whose name contains `name` (any case)"""
+        name = name.lower()
+        for idx, amount in zip(self.nutrient_ids, self.nutrient_amounts):
+            if name in _NUTRIENT_NAMES_LOWER[idx]:
+                return _compact_float(amount)
+        return 0
+
+    def food_portions(self) -> List[Dict[str, Any]]:
+        """Portions in the FDC foodPortions shape used by the amount parser"""
+        return [
+            {"portionDescription": desc, "gramWeight": grams}
+            for desc, grams in self.portions
+        ]
@@ -0,0 +1,190 @@
+"""
+Local on-disk copy of USDA FoodData Central foods with a keyword search index
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Set, Tuple
+from food_model import FoodRecord, SearchHit
+
+
+def normalize_fdc_date(value: Optional[str]) -> Optional[str]:
+    """Normalize FDC dates ('4/1/2019' or '2019-04-01') to ISO 'YYYY-MM-DD'"""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(value[:10], fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def food_updated_date(food: Dict[str, Any]) -> Optional[str]:
+    """Latest of a record's publication and modification dates, as ISO string"""
+    dates = [
+        normalize_fdc_date(food.get(key))
+        for key in ("publicationDate", "publishedDate", "modifiedDate")
+    ]
+    dates = [d for d in dates if d]
+    return max(dates) if dates else None
+
+
+def slim_food(food: Dict[str, Any]) -> FoodRecord:
+    """Reduce an FDC food document to the compact record the tools use"""
+    return FoodRecord.from_dict(food, updated=food_updated_date(food))
+
+
+def _tokenize(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class LocalFoodStore:
+    """
+    Store of FoodRecords keyed by FDC ID, kept as JSON lines on disk.
+
+    Keeps only the fields the tools need (nutrients, portions, header fields)
+    and maintains an inverted token index over descriptions and brands that is
+    updated in place as foods are upserted.
+
+    The file at `path` holds one food per line. Upserts are appended to a
+    `<path>.journal` file by flush(), which only costs as much as the change;
+    save() compacts everything back into `path` and drops the journal.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.foods: Dict[int, FoodRecord] = {}
+        self.index: Dict[str, Set[int]] = {}
+        self.data_type_counts: Dict[str, int] = {}
+        self._dirty: Dict[int, FoodRecord] = {}
+        self.load()
+
+    def load(self):
+        """Load foods and journal from disk (if present), rebuilding the index"""
+        self.foods = {}
+        self.index = {}
+        self.data_type_counts = {}
+        self._dirty = {}
+        for path in (self.path, self.journal_path):
+            for food in self._read_lines(path):
+                self._put(FoodRecord.from_dict(food))
+
+    def flush(self):
+        """Append foods upserted since the last flush/save to the journal"""
+        if not self._dirty:
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for food in self._dirty.values():
+                f.write(json.dumps(food.to_dict()) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._dirty = {}
+
+    def save(self):
+        """Atomically rewrite all foods to `path` and drop the journal"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for food in self.foods.values():
+                f.write(json.dumps(food.to_dict()) + "\n")
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._dirty = {}
+
+    def get(self, fdc_id: int) -> Optional[FoodRecord]:
+        return self.foods.get(int(fdc_id))
+
+    def upsert(self, food: Dict[str, Any]):
+        """Insert or replace a food document from an FDC API response"""
+        record = slim_food(food)
+        self._put(record)
+        self._dirty[record.fdc_id] = record
+
+    def has_data_type(self, data_type: str) -> bool:
+        return self.data_type_counts.get(data_type, 0) > 0
+
+    def search(
+        self, query: str, limit: int = 10, offset: int = 0
+    ) -> Tuple[List[SearchHit], int]:
+        """
+        Return (hits, total matches) for foods whose description/brand contain
+        every query token, most relevant first.
+
+        Relevance: descriptions starting with the query first, then those
+        where the query covers the largest share of the description's tokens
+        (so "Milk, whole" beats "Beverages, almond milk, unsweetened").
+        """
+        tokens = _tokenize(query)
+        if not tokens:
+            return [], 0
+
+        matches = None
+        for token in tokens:
+            ids = self.index.get(token, set())
+            matches = ids.copy() if matches is None else matches & ids
+            if not matches:
+                return [], 0
+
+        prefix = " ".join(tokens)
+        query_tokens = set(tokens)
+
+        def relevance(food: FoodRecord):
+            description = " ".join(_tokenize(food.description))
+            coverage = len(query_tokens) / max(len(self._food_tokens(food)), 1)
+            return (not description.startswith(prefix), -coverage, food.description)
+
+        foods = sorted((self.foods[fdc_id] for fdc_id in matches), key=relevance)
+        return [
+            SearchHit(food.fdc_id, food.description, food.data_type, food.brand_owner)
+            for food in foods[offset : offset + limit]
+        ], len(foods)
+
+    def _put(self, record: FoodRecord):
+        old = self.foods.get(record.fdc_id)
+        if old is not None:
+            self._unindex_food(old)
+        self.foods[record.fdc_id] = record
+        self._index_food(record)
+
+    @staticmethod
+    def _read_lines(path: str):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an interrupted flush
+                if "foods" in data:
+                    yield from data["foods"]  # Older single-document store
+                else:
+                    yield data
+
+    def _food_tokens(self, food: FoodRecord) -> Set[str]:
+        text = f"{food.description} {food.brand_owner or ''}"
+        return set(_tokenize(text))
+
+    def _index_food(self, food: FoodRecord):
+        for token in self._food_tokens(food):
+            self.index.setdefault(token, set()).add(food.fdc_id)
+        if food.data_type:
+            counts = self.data_type_counts
+            counts[food.data_type] = counts.get(food.data_type, 0) + 1
+
+    def _unindex_food(self, food: FoodRecord):
+        if food.data_type:
+            self.data_type_counts[food.data_type] -= 1
+        for token in self._food_tokens(food):
+            ids = self.index.get(token)
+            if ids is None:
+                continue
+            ids.discard(food.fdc_id)
+            if not ids:
+                del self.index[token]
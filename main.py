@@ -7,20 +7,30 @@ Run with: python main.py
 import asyncio
 import os
 import sys
-import mcp.server.stdio
 import mcp.types as types
-from mcp.server import NotificationOptions, Server
+from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
-import mcp.server.stdio
-from nutrition_tools import get_food_search, get_nutrition_by_id, search_nutrition_quick
+
+# nutrition_tools (with requests behind it) and the stdio transport are
+# imported on first use: every client window starts a fresh process.
+# Note that any mcp import still runs mcp/__init__.py, which loads most of
+# the SDK (including FastMCP); that part of startup can't be deferred here.
 
 # Create MCP server instance
 server = Server("nutrition-server")
 
+# Tool schemas, built once on the first list_tools call
+_TOOLS = None
 
-# Register our tools
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
+# nutrition_tools module, imported and configured on the first tool call
+_nutrition_tools = None
+
+# Future for the LocalFoodStore, loaded in a worker thread while the server
+# starts serving; only a tool call that arrives before it finishes waits
+_food_store_load = None
+
+
+def _build_tools() -> list[types.Tool]:
     return [
         types.Tool(
             name="search_food_items",
@@ -34,10 +44,14 @@ async def handle_list_tools() -> list[types.Tool]:
                     },
                     "limit": {
                         "type": "number",
-                        "description": "Maximum number of results to return (default: 10, max: 20)",
+                        "description": "Maximum number of results to return (default: 10, max: 200). Above 20, results are fetched 20 per page and streamed as progress updates",
                         "default": 10,
                         "minimum": 1,
-                        "maximum": 20,
+                        "maximum": 200,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Optional: cursor from a previous search_food_items result to get its next page. Pass the same query",
                     },
                 },
                 "required": ["query"],
@@ -84,6 +98,64 @@ async def handle_list_tools() -> list[types.Tool]:
     ]
 
 
+def _load_nutrition_tools():
+    """Import nutrition_tools and hand it the API key and snapshot"""
+    global _nutrition_tools
+    if _nutrition_tools is not None:
+        return _nutrition_tools
+
+    import nutrition_tools
+
+    nutrition_tools.API_KEY = os.getenv("USDA_API_KEY")
+
+    # Fast start: warm the caches from the snapshot saved at last shutdown
+    snapshot_path = os.getenv("NUTRITION_SNAPSHOT_PATH")
+    if snapshot_path:
+        from warm_cache import WarmCacheSnapshot
+
+        nutrition_tools.SNAPSHOT = WarmCacheSnapshot(snapshot_path)
+
+    _nutrition_tools = nutrition_tools
+    return _nutrition_tools
+
+
+def _load_food_store(path: str):
+    """Load the local food store (runs in a worker thread); None on failure"""
+    from food_store import LocalFoodStore
+
+    try:
+        store = LocalFoodStore(path)
+    except Exception as e:
+        print(f"⚠️  Local food store not loaded: {e}", file=sys.stderr)
+        return None
+    print(f"✅ Local food store loaded: {path}", file=sys.stderr)
+    return store
+
+
+def _progress_reporter():
+    """Stream each page of a search as a progress notification, if requested"""
+    ctx = server.request_context
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+
+    async def on_page(text: str, fetched: int, total: int):
+        await ctx.session.send_progress_notification(
+            token, fetched, total=total, message=text
+        )
+
+    return on_page
+
+
+# Register our tools
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    global _TOOLS
+    if _TOOLS is None:
+        _TOOLS = _build_tools()
+    return _TOOLS
+
+
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
@@ -92,22 +164,29 @@ async def handle_call_tool(
         arguments = {}
 
     try:
+        tools = _load_nutrition_tools()
+        if _food_store_load is not None:
+            tools.FOOD_STORE = await _food_store_load
+
         if name == "search_food_items":
             query = arguments["query"]
-            limit = min(arguments.get("limit", 10), 20)
-            result = await get_food_search(query, limit)
+            limit = min(arguments.get("limit", 10), tools.MAX_LIMIT)
+            cursor = arguments.get("cursor")
+            result = await tools.get_food_search(
+                query, limit, cursor, on_page=_progress_reporter()
+            )
             return [types.TextContent(type="text", text=result)]
 
         elif name == "get_nutrition_by_id":
             fdc_id = arguments["fdcId"]
             amount = arguments.get("amount", "100g")
-            result = await get_nutrition_by_id(fdc_id, amount)
+            result = await tools.get_nutrition_by_id(fdc_id, amount)
             return [types.TextContent(type="text", text=result)]
 
         elif name == "search_nutrition":
             ingredient = arguments["ingredient"]
             amount = arguments.get("amount", "100g")
-            result = await search_nutrition_quick(ingredient, amount)
+            result = await tools.search_nutrition_quick(ingredient, amount)
             return [types.TextContent(type="text", text=result)]
 
         else:
@@ -118,6 +197,8 @@ async def handle_call_tool(
 
 
 async def main():
+    global _food_store_load
+
     # Check for API key
     api_key = os.getenv("USDA_API_KEY")
     if not api_key:
@@ -133,25 +214,35 @@ async def main():
     print("✅ Ready! Add to Claude Desktop config and restart Claude.", file=sys.stderr)
     print("Press Ctrl+C to stop this test.", file=sys.stderr)
 
-    # Store API key globally for tools to use
-    import nutrition_tools
+    # Use the local food store from fdc_sync.py if one is configured. It is
+    # parsed in the background so `initialize` is answered straight away
+    store_path = os.getenv("NUTRITION_STORE_PATH")
+    if store_path and os.path.exists(store_path):
+        loop = asyncio.get_running_loop()
+        _food_store_load = loop.run_in_executor(None, _load_food_store, store_path)
 
-    nutrition_tools.API_KEY = api_key
+    from mcp.server.stdio import stdio_server
 
     # Run the server using stdin/stdout
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="nutrition-server",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="nutrition-server",
+                    server_version="1.0.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        # Save hot foods/searches so the next window starts warm
+        snapshot_path = os.getenv("NUTRITION_SNAPSHOT_PATH")
+        if snapshot_path and _nutrition_tools is not None:
+            _nutrition_tools.save_snapshot(snapshot_path)
 
 
 if __name__ == "__main__":
@@ -3,28 +3,152 @@ Nutrition tool functions using official MCP pattern
 """
 
 import asyncio
-import requests
-from typing import Dict, List, Any
+import base64
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
+from food_model import FoodRecord, SearchHit
+from food_store import slim_food
 from utils import (
     parse_amount_and_get_multiplier,
     format_nutrition_data,
+    format_search_page,
     format_search_results,
 )
 
 # Global API key (set by main.py)
 API_KEY = None
 
+# Optional LocalFoodStore kept fresh by fdc_sync.py (set by main.py)
+FOOD_STORE = None
 
-async def get_food_search(query: str, limit: int = 10) -> str:
-    """Search for food items and return formatted results"""
-    if not API_KEY:
-        raise Exception("USDA API key not configured")
+# Optional WarmCacheSnapshot saved at the last shutdown (set by main.py)
+SNAPSHOT = None
+
+# In-process LRU caches of recent foods and searches, as (fetched_at, value)
+CACHE_SIZE = 256
+_food_cache: "OrderedDict[int, Tuple[float, FoodRecord]]" = OrderedDict()
+_search_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Searches larger than one FDC page are fetched PAGE_SIZE items at a time
+PAGE_SIZE = 20
+MAX_LIMIT = 200
+
+# In-flight prefetches of the next search page, keyed like _search_cache
+_prefetches: Dict[str, "asyncio.Task"] = {}
+
+
+def _cache_put(cache: OrderedDict, key, value, fetched_at: Optional[float] = None):
+    cache[key] = (fetched_at or time.time(), value)
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _search_key(query: str, page_size: int, page_number: int) -> str:
+    return f"{page_size}:{page_number}:{query.strip().lower()}"
+
+
+def encode_cursor(query: str, page_size: int, offset: int, local: bool = False) -> str:
+    """Opaque cursor pointing at the next result (0-based offset) of a search"""
+    state = {"q": query, "s": page_size, "o": offset}
+    if local:
+        state["l"] = 1  # Continue in the local food store, not the API
+    raw = json.dumps(state)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        state = {
+            "q": str(state["q"]),
+            "s": int(state["s"]),
+            "o": int(state["o"]),
+            "l": bool(state.get("l", False)),
+        }
+        if not 1 <= state["s"] <= PAGE_SIZE or state["o"] < 0:
+            raise ValueError("cursor out of range")
+        return state
+    except (ValueError, KeyError, TypeError):
+        raise Exception("Invalid search cursor; start a new search without one")
+
+
+def _cached(cache: OrderedDict, key, snapshot_lookup) -> Optional[Any]:
+    """Look up memory first, then the snapshot (promoting hits into memory)"""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key][1]
+    entry = snapshot_lookup(key) if SNAPSHOT else None
+    if entry is None:
+        return None
+    fetched_at, value = entry
+    _cache_put(cache, key, value, fetched_at)
+    return value
+
+
+def _page_to_dict(page: Dict[str, Any]) -> Dict[str, Any]:
+    return {**page, "foods": [hit.to_dict() for hit in page["foods"]]}
+
+
+def _food_from_snapshot(fdc_id: int) -> Optional[Tuple[float, FoodRecord]]:
+    entry = SNAPSHOT.get_food(fdc_id)
+    if entry is None:
+        return None
+    fetched_at, food = entry
+    return fetched_at, FoodRecord.from_dict(food)
+
+
+def _page_from_snapshot(key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+    entry = SNAPSHOT.get_search(key)
+    if entry is None:
+        return None
+    fetched_at, page = entry
+    hits = [SearchHit.from_dict(hit) for hit in page["foods"]]
+    return fetched_at, {**page, "foods": hits}
+
+
+def save_snapshot(path: str):
+    """
+    Write this session's foods and searches to a snapshot for the next start
+
+    Only entries used in this session are kept, each with the time it was
+    originally fetched, so the snapshot can drop them once they are stale.
+    """
+    global SNAPSHOT
+
+    foods = {
+        fdc_id: (fetched_at, food.to_dict())
+        for fdc_id, (fetched_at, food) in _food_cache.items()
+    }
+    searches = {
+        key: (fetched_at, _page_to_dict(page))
+        for key, (fetched_at, page) in _search_cache.items()
+    }
+
+    if SNAPSHOT:
+        SNAPSHOT.close()
+        SNAPSHOT = None
+
+    from warm_cache import WarmCacheSnapshot
+
+    WarmCacheSnapshot.write(path, foods, searches)
+
+
+async def _request_search_page(
+    query: str, page_size: int, page_number: int
+) -> Dict[str, Any]:
+    """Fetch one page of FDC search results and cache it"""
+    import requests
 
     url = f"https://api.nal.usda.gov/fdc/v1/foods/search"
 
     payload = {
         "query": query,
-        "pageSize": limit,
+        "pageSize": page_size,
+        "pageNumber": page_number,
         "dataType": ["Foundation", "SR Legacy", "Survey (FNDDS)", "Branded"],
         "sortBy": "dataType.keyword",
         "sortOrder": "asc",
@@ -42,22 +166,173 @@ async def get_food_search(query: str, limit: int = 10) -> str:
         raise Exception(f"USDA API error {response.status_code}: {response.text}")
 
     data = response.json()
+    foods = data.get("foods") or []
+
+    page = {
+        "foods": [SearchHit.from_dict(food) for food in foods],
+        "totalHits": data.get("totalHits", len(foods)),
+        "totalPages": data.get("totalPages", 1),
+    }
+    _cache_put(_search_cache, _search_key(query, page_size, page_number), page)
+    return page
+
+
+async def _get_search_page(
+    query: str, page_size: int, page_number: int
+) -> Dict[str, Any]:
+    """Return a search page from cache, a pending prefetch, or the API"""
+    key = _search_key(query, page_size, page_number)
+    page = _cached(_search_cache, key, _page_from_snapshot)
+    if page is not None:
+        return page
+
+    task = _prefetches.get(key)
+    if task is not None:
+        try:
+            # Shared with other callers: don't let our cancellation kill it
+            return await asyncio.shield(task)
+        except Exception:
+            pass  # Failed prefetch: retry below
+
+    return await _request_search_page(query, page_size, page_number)
 
-    if not data.get("foods"):
+
+def _prefetch_search_page(query: str, page_size: int, page_number: int):
+    """Start fetching a page in the background so the next cursor call is warm"""
+    key = _search_key(query, page_size, page_number)
+    if key in _search_cache or key in _prefetches:
+        return
+    if SNAPSHOT and key in SNAPSHOT.searches:
+        return
+
+    task = asyncio.ensure_future(_request_search_page(query, page_size, page_number))
+    _prefetches[key] = task
+
+    def _done(t: "asyncio.Task"):
+        _prefetches.pop(key, None)
+        if not t.cancelled():
+            t.exception()  # Mark retrieved; a failed page is refetched on demand
+
+    task.add_done_callback(_done)
+
+
+async def _format_store_search(
+    query: str,
+    hits: List[SearchHit],
+    offset: int,
+    total_hits: int,
+    page_size: int,
+    on_page: Optional[Callable[[str, int, int], Awaitable[None]]],
+) -> str:
+    if not hits:
         raise Exception(f"No food items found for '{query}'")
 
-    results = [
-        {
-            "fdcId": food["fdcId"],
-            "description": food["description"],
-            "dataType": food["dataType"],
-            "brandOwner": food.get("brandOwner"),
-            "ingredients": food.get("ingredients"),
-        }
-        for food in data["foods"]
-    ]
+    if on_page:
+        await on_page(format_search_page(hits, offset + 1), len(hits), len(hits))
+
+    next_cursor = None
+    position = offset + len(hits)
+    if position < total_hits:
+        next_cursor = encode_cursor(query, page_size, position, local=True)
+
+    return format_search_results(
+        hits,
+        query,
+        start=offset + 1,
+        total_hits=total_hits,
+        next_cursor=next_cursor,
+    )
+
+
+async def get_food_search(
+    query: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    on_page: Optional[Callable[[str, int, int], Awaitable[None]]] = None,
+) -> str:
+    """
+    Search for food items and return formatted results
+
+    Limits above PAGE_SIZE are fetched page by page and on_page(text,
+    fetched, total) is awaited as each page's results arrive. A cursor from
+    a previous result continues that search at the exact next item. Only
+    calls that are paging (a cursor, or limit above PAGE_SIZE) prefetch the
+    next page, so ordinary searches cost a single FDC request.
+
+    A local food store answers a fresh search only when it holds Branded
+    foods (so it covers what the API would return) and has at least `limit`
+    matches; otherwise the API is used. Store searches page with their own
+    cursors.
+    """
+    if not API_KEY:
+        raise Exception("USDA API key not configured")
+
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    local = False
+
+    if cursor:
+        state = decode_cursor(cursor)
+        if query and query.strip().lower() != state["q"].strip().lower():
+            raise Exception(
+                f"Cursor belongs to a search for '{state['q']}', not '{query}'"
+            )
+        query, page_size, offset = state["q"], state["s"], state["o"]
+        local = state["l"]
+    else:
+        page_size = min(limit, PAGE_SIZE)
+        offset = 0
+
+    if FOOD_STORE and (local or FOOD_STORE.has_data_type("Branded")):
+        hits, total_hits = FOOD_STORE.search(query, limit, offset)
+        if local or len(hits) >= limit:
+            return await _format_store_search(
+                query, hits, offset, total_hits, page_size, on_page
+            )
 
-    return format_search_results(results, query)
+    prefetch = bool(cursor) or limit > PAGE_SIZE
+    results = []
+    position = offset
+    total_hits = None
+    exhausted = False
+
+    while len(results) < limit and (total_hits is None or position < total_hits):
+        page_number = position // page_size + 1
+        page = await _get_search_page(query, page_size, page_number)
+        total_hits = page["totalHits"]
+
+        if prefetch and page_number < page["totalPages"]:
+            _prefetch_search_page(query, page_size, page_number + 1)
+
+        skip = position - (page_number - 1) * page_size
+        hits = page["foods"][skip : skip + limit - len(results)]
+        if not hits:
+            exhausted = True
+            break
+
+        results.extend(hits)
+        position += len(hits)
+        if on_page:
+            expected = max(min(limit, total_hits - offset), len(results))
+            await on_page(
+                format_search_page(hits, position - len(hits) + 1),
+                len(results),
+                expected,
+            )
+
+    if not results:
+        raise Exception(f"No food items found for '{query}'")
+
+    next_cursor = None
+    if not exhausted and position < total_hits:
+        next_cursor = encode_cursor(query, page_size, position)
+
+    return format_search_results(
+        results,
+        query,
+        start=offset + 1,
+        total_hits=total_hits,
+        next_cursor=next_cursor,
+    )
 
 
 async def get_nutrition_by_id(fdc_id: int, amount: str = "100g") -> str:
@@ -65,44 +340,47 @@ async def get_nutrition_by_id(fdc_id: int, amount: str = "100g") -> str:
     if not API_KEY:
         raise Exception("USDA API key not configured")
 
-    url = f"https://api.nal.usda.gov/fdc/v1/food/{fdc_id}"
-    params = {"api_key": API_KEY}
+    fdc_id = int(fdc_id)
 
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None, lambda: requests.get(url, params=params, timeout=10)
-    )
+    # The local synced copy wins over cached or snapshot data
+    data = FOOD_STORE.get(fdc_id) if FOOD_STORE else None
 
-    if not response.ok:
-        raise Exception(f"USDA API error {response.status_code}: {response.text}")
+    if data is None:
+        data = _cached(_food_cache, fdc_id, _food_from_snapshot)
 
-    data = response.json()
+    if data is None:
+        import requests
+
+        url = f"https://api.nal.usda.gov/fdc/v1/food/{fdc_id}"
+        params = {"api_key": API_KEY}
 
-    # Extract nutrients and food portions
-    nutrients = data.get("foodNutrients", [])
-    food_portions = data.get("foodPortions", [])
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(
+            None, lambda: requests.get(url, params=params, timeout=10)
+        )
 
-    def get_nutrient_value(nutrient_name: str) -> float:
-        for nutrient in nutrients:
-            if (
-                nutrient_name.lower()
-                in nutrient.get("nutrient", {}).get("name", "").lower()
-            ):
-                return nutrient.get("amount", 0)
-        return 0
+        if not response.ok:
+            raise Exception(
+                f"USDA API error {response.status_code}: {response.text}"
+            )
+
+        data = slim_food(response.json())
+        _cache_put(_food_cache, fdc_id, data)
 
     # Parse amount using USDA portion data
-    multiplier, portion_note = parse_amount_and_get_multiplier(amount, food_portions)
+    multiplier, portion_note = parse_amount_and_get_multiplier(
+        amount, data.food_portions()
+    )
 
     # Get base values (per 100g) and apply multiplier
     nutrition_data = {
-        "name": data.get("description", f"Food Item {fdc_id}"),
-        "calories": get_nutrient_value("Energy") * multiplier,
-        "protein": get_nutrient_value("Protein") * multiplier,
-        "carbs": get_nutrient_value("Carbohydrate") * multiplier,
-        "fat": get_nutrient_value("Total lipid") * multiplier,
-        "fiber": get_nutrient_value("Fiber") * multiplier,
-        "sugar": get_nutrient_value("Sugars") * multiplier,
+        "name": data.description or f"Food Item {fdc_id}",
+        "calories": data.nutrient_amount("Energy") * multiplier,
+        "protein": data.nutrient_amount("Protein") * multiplier,
+        "carbs": data.nutrient_amount("Carbohydrate") * multiplier,
+        "fat": data.nutrient_amount("Total lipid") * multiplier,
+        "fiber": data.nutrient_amount("Fiber") * multiplier,
+        "sugar": data.nutrient_amount("Sugars") * multiplier,
         "serving_size": amount,
         "portion_note": portion_note,
     }
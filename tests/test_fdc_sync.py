@@ -0,0 +1,210 @@
+"""
+Tests for the incremental FDC sync, using an in-memory fake of USDAApi
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from fdc_sync import IncrementalSync
+from food_store import LocalFoodStore
+
+
+class FakeApi:
+    """Serves list pages newest-publication-first and /foods lookups"""
+
+    def __init__(self, foods):
+        self.foods = {food["fdcId"]: food for food in foods}
+        self.listed_pages = []
+        self.fetched_ids = []
+        self.fail_on_fetch = None
+        self.unavailable = set()
+
+    def _sorted(self):
+        return sorted(
+            self.foods.values(),
+            key=lambda food: (food["publicationDate"], food["fdcId"]),
+            reverse=True,
+        )
+
+    async def list_foods(self, page_number, page_size, data_types):
+        self.listed_pages.append(page_number)
+        start = (page_number - 1) * page_size
+        return [
+            self._abridged(food) for food in self._sorted()[start : start + page_size]
+        ]
+
+    @staticmethod
+    def _abridged(food):
+        # Like /foods/list: header fields and publicationDate, no modifiedDate
+        return {
+            key: food[key]
+            for key in ("fdcId", "description", "dataType", "publicationDate")
+        }
+
+    async def get_foods(self, fdc_ids):
+        failing = self.fail_on_fetch is not None
+        if failing and len(self.fetched_ids) >= self.fail_on_fetch:
+            raise RuntimeError("connection dropped")
+        self.fetched_ids.extend(fdc_ids)
+        # Like /foods: IDs it cannot serve are left out without an error
+        return [
+            dict(self.foods[fdc_id])
+            for fdc_id in fdc_ids
+            if fdc_id not in self.unavailable
+        ]
+
+
+def make_food(fdc_id, published, description=None, **extra):
+    return {
+        "fdcId": fdc_id,
+        "description": description or f"Food {fdc_id}",
+        "dataType": "SR Legacy",
+        "publicationDate": published,
+        "foodNutrients": [{"nutrient": {"name": "Energy"}, "amount": fdc_id}],
+        **extra,
+    }
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "store.json"), str(tmp_path / "store.json.sync.json")
+
+
+def run_sync(api, paths, **kwargs):
+    store_path, checkpoint_path = paths
+    kwargs.setdefault("page_size", 10)
+    kwargs.setdefault("batch_size", 5)
+    sync = IncrementalSync(
+        api, LocalFoodStore(store_path), checkpoint_path, min_interval=0, **kwargs
+    )
+    return asyncio.run(sync.run())
+
+
+def test_first_sync_fetches_everything_and_sets_watermark(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 26)])
+    api.foods[3]["publicationDate"] = "2021-10-28"
+
+    summary = run_sync(api, paths)
+
+    assert summary["refetched"] == 25
+    assert summary["watermark"] == "2021-10-28"
+    assert len(LocalFoodStore(paths[0]).foods) == 25
+
+
+def test_interrupted_sync_resumes_from_checkpoint(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.fail_on_fetch = 15  # dies during the second list page's refetches
+
+    with pytest.raises(RuntimeError):
+        run_sync(api, paths)
+
+    with open(paths[1]) as f:
+        checkpoint = json.load(f)["in_progress"]
+    assert checkpoint["page_number"] == 3
+    assert len(checkpoint["pending_ids"]) == 10
+
+    api.fail_on_fetch = None
+    api.listed_pages.clear()
+    summary = run_sync(api, paths)
+
+    assert api.listed_pages[0] == 3  # pages 1-2 are not walked again
+    assert summary["refetched"] == 20  # page 2's pending IDs + page 3
+    assert len(LocalFoodStore(paths[0]).foods) == 30
+
+
+def test_unchanged_sync_stops_at_watermark(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.foods[1]["publicationDate"] = "2021-10-28"
+    run_sync(api, paths)
+
+    api.listed_pages.clear()
+    api.fetched_ids.clear()
+    summary = run_sync(api, paths)
+
+    assert api.listed_pages == [1, 2]
+    assert api.fetched_ids == []
+    assert summary["watermark"] == "2021-10-28"
+
+
+def test_newly_published_record_is_the_only_refetch(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    run_sync(api, paths)
+
+    api.foods[31] = make_food(31, "2022-04-28")
+    api.foods[7] = make_food(7, "2022-04-28", description="Food 7, revised")
+    api.fetched_ids.clear()
+    summary = run_sync(api, paths)
+
+    assert sorted(api.fetched_ids) == [7, 31]
+    assert summary["watermark"] == "2022-04-28"
+    assert LocalFoodStore(paths[0]).get(7).description == "Food 7, revised"
+
+
+def test_branded_full_scan_catches_modified_only_changes(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.foods[1]["publicationDate"] = "2021-10-28"
+    run_sync(api, paths, data_types=["Branded"])
+
+    # Old publication date, newer modification: sorts past the stop point
+    api.foods[25]["modifiedDate"] = "2023-01-05"
+    api.fetched_ids.clear()
+    summary = run_sync(api, paths, data_types=["Branded"])
+
+    assert sorted(api.fetched_ids) == list(range(1, 31))  # full documents
+    assert summary["refetched"] == 1
+    assert LocalFoodStore(paths[0]).get(25).updated == "2023-01-05"
+
+
+def test_interrupted_sync_keeps_refetches_in_journal(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.fail_on_fetch = 15
+
+    with pytest.raises(RuntimeError):
+        run_sync(api, paths)
+
+    # Page 1 was journalled before its checkpoint; nothing compacted yet
+    store = LocalFoodStore(paths[0])
+    assert sorted(store.foods) == list(range(21, 31))
+    assert os.path.exists(store.journal_path)
+
+    api.fail_on_fetch = None
+    run_sync(api, paths)
+
+    assert not os.path.exists(store.journal_path)
+    assert len(LocalFoodStore(paths[0]).foods) == 30
+
+
+def test_unavailable_ids_are_not_refetched_and_do_not_block_the_stop(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.foods[1]["publicationDate"] = "2021-10-28"
+    api.unavailable = {25}
+    run_sync(api, paths)
+
+    with open(paths[1]) as f:
+        assert list(json.load(f)["unavailable"]) == ["25"]
+
+    api.listed_pages.clear()
+    api.fetched_ids.clear()
+    run_sync(api, paths)
+
+    assert api.listed_pages == [1, 2]
+    assert api.fetched_ids == []
+
+
+def test_unavailable_id_is_retried_once_republished(paths):
+    api = FakeApi([make_food(i, "2019-04-01") for i in range(1, 31)])
+    api.unavailable = {25}
+    run_sync(api, paths)
+
+    api.unavailable = set()
+    api.foods[25]["publicationDate"] = "2999-01-01"
+    api.fetched_ids.clear()
+    run_sync(api, paths)
+
+    assert api.fetched_ids == [25]
+    assert LocalFoodStore(paths[0]).get(25) is not None
+    with open(paths[1]) as f:
+        assert json.load(f)["unavailable"] == {}
@@ -0,0 +1,106 @@
+"""
+Tests for the compact food model against the plain FDC dict shape
+"""
+
+import pytest
+
+from food_model import FoodRecord, SearchHit
+from utils import format_nutrition_data
+
+FOOD = {
+    "fdcId": 171688,
+    "description": "Apples, raw, with skin",
+    "dataType": "SR Legacy",
+    "brandOwner": None,
+    "updated": "2019-04-01",
+    "foodNutrients": [
+        {"nutrient": {"name": "Protein"}, "amount": 0.26},
+        {"nutrient": {"name": "Total lipid (fat)"}, "amount": 0.17},
+        {"nutrient": {"name": "Carbohydrate, by difference"}, "amount": 13.81},
+        {"nutrient": {"name": "Energy"}, "amount": 52.0},
+        {"nutrient": {"name": "Energy (Atwater General Factors)"}, "amount": 54.0},
+        {"nutrient": {"name": "Fiber, total dietary"}, "amount": 2.4},
+        {"nutrient": {"name": "Sugars, total including NLEA"}, "amount": 10.39},
+    ],
+    "foodPortions": [
+        {"portionDescription": "1 cup, sliced", "gramWeight": 109.0},
+        {"portionDescription": "1 medium", "gramWeight": 182.0},
+    ],
+}
+
+
+def old_nutrient_value(food, nutrient_name):
+    # The dict lookup nutrition_tools used before FoodRecord
+    for nutrient in food.get("foodNutrients", []):
+        name = nutrient.get("nutrient", {}).get("name", "")
+        if nutrient_name.lower() in name.lower():
+            return nutrient.get("amount", 0)
+    return 0
+
+
+def nutrition_data(value, multiplier):
+    return {
+        "name": "Apple",
+        "calories": value("Energy") * multiplier,
+        "protein": value("Protein") * multiplier,
+        "carbs": value("Carbohydrate") * multiplier,
+        "fat": value("Total lipid") * multiplier,
+        "fiber": value("Fiber") * multiplier,
+        "sugar": value("Sugars") * multiplier,
+        "serving_size": "test",
+        "portion_note": "",
+    }
+
+
+def test_food_record_round_trip():
+    record = FoodRecord.from_dict(FOOD)
+
+    assert record.to_dict() == FOOD
+    assert FoodRecord.from_dict(record.to_dict()).to_dict() == FOOD
+
+
+def test_search_hit_round_trip():
+    hit = {"fdcId": 1, "description": "Tofu", "dataType": "Branded", "brandOwner": "X"}
+
+    assert SearchHit.from_dict(hit).to_dict() == hit
+
+
+@pytest.mark.parametrize(
+    "name", ["Energy", "energy", "Protein", "Carbohydrate", "Sugars", "Vitamin C"]
+)
+def test_nutrient_amount_matches_old_lookup(name):
+    record = FoodRecord.from_dict(FOOD)
+
+    assert record.nutrient_amount(name) == old_nutrient_value(FOOD, name)
+
+
+def test_nutrient_amount_takes_first_substring_match():
+    # "Energy" also matches "Energy (Atwater General Factors)", listed later
+    assert FoodRecord.from_dict(FOOD).nutrient_amount("Energy") == 52.0
+
+
+def test_missing_nutrient_and_null_amount_are_zero():
+    food = {
+        "fdcId": 1,
+        "foodNutrients": [{"nutrient": {"name": "Protein"}, "amount": None}],
+    }
+    record = FoodRecord.from_dict(food)
+
+    assert record.nutrient_amount("Protein") == 0
+    assert record.nutrient_amount("Energy") == 0
+
+
+@pytest.mark.parametrize("multiplier", [1.0, 0.15, 1.09, 1.82, 2.5, 3.33])
+def test_formatted_output_matches_dict_shape(multiplier):
+    record = FoodRecord.from_dict(FOOD)
+
+    old = format_nutrition_data(
+        nutrition_data(lambda name: old_nutrient_value(FOOD, name), multiplier)
+    )
+    new = format_nutrition_data(nutrition_data(record.nutrient_amount, multiplier))
+
+    assert new == old
+
+
+def test_food_portions_match_dict_shape():
+    assert FoodRecord.from_dict(FOOD).food_portions() == FOOD["foodPortions"]
@@ -0,0 +1,201 @@
+"""
+Tests for paginated food search, using a fake requests.post
+"""
+
+import asyncio
+import re
+import sys
+import types
+
+import pytest
+
+import nutrition_tools
+from food_store import LocalFoodStore
+
+TOTAL_HITS = 95
+
+
+class FakeResponse:
+    ok = True
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Install a fake requests module and reset nutrition_tools' state"""
+    calls = []
+
+    def post(url, json, params, timeout):
+        size, number = json["pageSize"], json["pageNumber"]
+        calls.append((size, number))
+        ids = range((number - 1) * size + 1, min(number * size, TOTAL_HITS) + 1)
+        return FakeResponse(
+            {
+                "foods": [
+                    {"fdcId": i, "description": f"Tofu {i}", "dataType": "Branded"}
+                    for i in ids
+                ],
+                "totalHits": TOTAL_HITS,
+                "totalPages": -(-TOTAL_HITS // size),
+            }
+        )
+
+    monkeypatch.setitem(sys.modules, "requests", types.SimpleNamespace(post=post))
+    monkeypatch.setattr(nutrition_tools, "API_KEY", "test-key")
+    monkeypatch.setattr(nutrition_tools, "FOOD_STORE", None)
+    monkeypatch.setattr(nutrition_tools, "SNAPSHOT", None)
+    nutrition_tools._search_cache.clear()
+    nutrition_tools._prefetches.clear()
+    return calls
+
+
+def search(*args, settle=True, **kwargs):
+    async def run():
+        result = await nutrition_tools.get_food_search(*args, **kwargs)
+        if settle:
+            await asyncio.sleep(0)  # let any prefetch finish
+            await asyncio.sleep(0)
+        return result
+
+    return asyncio.run(run())
+
+
+def ids(output):
+    return [int(i) for i in re.findall(r"ID: (\d+)", output)]
+
+
+def cursor_of(output):
+    match = re.search(r'cursor "([^"]+)"', output)
+    return match.group(1) if match else None
+
+
+def test_limit_is_exact_across_pages(calls):
+    progress = []
+
+    async def on_page(text, fetched, total):
+        progress.append((fetched, total))
+
+    output = search("tofu", 25, on_page=on_page)
+
+    assert ids(output) == list(range(1, 26))
+    assert "Showing 1-25 of 95" in output
+    assert progress == [(20, 25), (25, 25)]
+
+
+def test_cursor_resumes_at_next_item(calls):
+    first = search("tofu", 25)
+    second = search("tofu", 10, cursor_of(first))
+
+    assert ids(second) == list(range(26, 36))
+    assert "Showing 26-35 of 95" in second
+
+
+def test_last_page_has_no_cursor(calls):
+    first = search("tofu", 90)
+    rest = search("tofu", 50, cursor_of(first))
+
+    assert ids(rest) == list(range(91, 96))
+    assert cursor_of(rest) is None
+
+
+def test_cursor_round_trip():
+    cursor = nutrition_tools.encode_cursor("firm tofu", 20, 45)
+
+    assert nutrition_tools.decode_cursor(cursor) == {
+        "q": "firm tofu",
+        "s": 20,
+        "o": 45,
+        "l": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        nutrition_tools.encode_cursor("tofu", 0, 0),
+        nutrition_tools.encode_cursor("tofu", 21, 0),
+        nutrition_tools.encode_cursor("tofu", 10, -1),
+        "not-a-cursor",
+    ],
+)
+def test_invalid_cursor_is_rejected(calls, cursor):
+    with pytest.raises(Exception, match="Invalid search cursor"):
+        search("tofu", 10, cursor)
+    assert calls == []
+
+
+def test_cursor_for_other_query_is_rejected(calls):
+    cursor = cursor_of(search("tofu", 10))
+
+    with pytest.raises(Exception, match="belongs to a search for 'tofu'"):
+        search("tempeh", 10, cursor)
+
+
+def test_ordinary_search_makes_one_request(calls):
+    search("tofu", 10)
+
+    assert calls == [(10, 1)]
+
+
+def test_paging_prefetches_next_page(calls):
+    first = search("tofu", 25)
+    assert calls == [(20, 1), (20, 2), (20, 3)]
+
+    search("tofu", 10, cursor_of(first))
+    assert len(calls) == 3  # served from the prefetched pages
+
+
+@pytest.fixture
+def store(calls, tmp_path, monkeypatch):
+    """A local food store with a few milks, installed as FOOD_STORE"""
+    store = LocalFoodStore(str(tmp_path / "store.json"))
+    for fdc_id, description, data_type in [
+        (1, "Beverages, almond milk, unsweetened", "SR Legacy"),
+        (2, "Milk, whole, 3.25% milkfat", "SR Legacy"),
+        (3, "Milk, lowfat, 1% milkfat", "SR Legacy"),
+        (4, "Oat milk", "Branded"),
+    ]:
+        store.upsert(
+            {"fdcId": fdc_id, "description": description, "dataType": data_type}
+        )
+    monkeypatch.setattr(nutrition_tools, "FOOD_STORE", store)
+    return store
+
+
+def test_store_search_ranks_prefix_matches_first(store):
+    hits, total = store.search("milk", limit=10)
+
+    assert [hit.fdc_id for hit in hits] == [3, 2, 4, 1]
+    assert total == 4
+
+
+def test_store_answers_when_it_covers_the_limit(calls, store):
+    first = search("milk", 2)
+
+    assert calls == []
+    assert ids(first) == [3, 2]
+
+    rest = search("milk", 2, cursor_of(first))
+    assert calls == []
+    assert ids(rest) == [4, 1]
+    assert cursor_of(rest) is None
+
+
+def test_store_with_too_few_hits_falls_back_to_api(calls, store):
+    result = search("milk", 10)
+
+    assert calls == [(10, 1)]
+    assert ids(result) == list(range(1, 11))
+
+
+def test_store_without_branded_foods_falls_back_to_api(calls, store):
+    store.upsert({"fdcId": 4, "description": "Oat milk", "dataType": "Foundation"})
+
+    search("milk", 2)
+
+    assert calls == [(2, 1)]
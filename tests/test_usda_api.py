@@ -0,0 +1,36 @@
+"""
+Tests for the USDAApi client, using a fake requests.get
+"""
+
+import asyncio
+import types
+
+import usda_api
+
+FOOD = {
+    "fdcId": 171688,
+    "description": "Apples, raw, with skin",
+    "foodNutrients": [
+        {"nutrient": {"name": "Carbohydrate, by difference"}, "amount": 13.81},
+        {"nutrient": {"name": "Energy"}, "amount": 52.0},
+        {"nutrient": {"name": "Energy (Atwater General Factors)"}, "amount": 54.0},
+        {"nutrient": {"name": "Sugars, total including NLEA"}, "amount": 10.39},
+    ],
+    "foodPortions": [{"portionDescription": "1 medium", "gramWeight": 182.0}],
+}
+
+
+def test_get_nutrition_by_id_reads_the_compact_record(monkeypatch):
+    response = types.SimpleNamespace(ok=True, json=lambda: FOOD)
+    monkeypatch.setattr(
+        usda_api, "requests", types.SimpleNamespace(get=lambda *a, **k: response)
+    )
+
+    data = asyncio.run(
+        usda_api.USDAApi("test-key").get_nutrition_by_id(171688, "200g")
+    )
+
+    assert data["name"] == "Apples, raw, with skin"
+    assert data["calories"] == 52.0 * 2  # first "Energy" match
+    assert data["carbs"] == 13.81 * 2
+    assert data["sugar"] == 10.39 * 2
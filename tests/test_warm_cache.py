@@ -0,0 +1,108 @@
+"""
+Tests for the memory-mapped warm cache snapshot
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+import nutrition_tools
+from food_store import LocalFoodStore
+from warm_cache import MAGIC, WarmCacheSnapshot
+
+
+def make_food(fdc_id, description):
+    return {
+        "fdcId": fdc_id,
+        "description": description,
+        "dataType": "SR Legacy",
+        "foodNutrients": [{"nutrient": {"name": "Energy"}, "amount": 52.0}],
+        "foodPortions": [],
+    }
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "warm_cache.snap")
+
+
+def test_round_trip(path):
+    now = time.time()
+    page = {"foods": [{"fdcId": 1}], "totalHits": 1}
+    WarmCacheSnapshot.write(
+        path, {1: (now, make_food(1, "Apple"))}, {"apple|10|1": (now, page)}
+    )
+
+    snapshot = WarmCacheSnapshot(path)
+
+    assert snapshot.get_food(1) == (now, make_food(1, "Apple"))
+    assert snapshot.get_search("apple|10|1") == (now, page)
+    assert snapshot.get_food(2) is None
+    snapshot.close()
+
+
+def test_entries_older_than_max_age_are_dropped(path):
+    now = time.time()
+    WarmCacheSnapshot.write(
+        path,
+        {1: (now, make_food(1, "Apple")), 2: (now - 7200, make_food(2, "Pear"))},
+        {"pear|10|1": (now - 7200, {"foods": []})},
+    )
+
+    snapshot = WarmCacheSnapshot(path, max_age=3600)
+
+    assert list(snapshot.foods) == [1]
+    assert snapshot.searches == {}
+    snapshot.close()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"NOTASNAP\n{}\n",
+        MAGIC + b'{"foods": {"1": [0, 10',  # truncated index
+        MAGIC + b'{"foods": {"1": [0, 10]}}\n',  # span without fetched_at
+        MAGIC + b'{"foods": {"1": null}}\n',
+        MAGIC + b"[]\n",
+    ],
+)
+def test_bad_snapshot_starts_cold(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+
+    snapshot = WarmCacheSnapshot(path)
+
+    assert snapshot.foods == {}
+    assert snapshot.get_food(1) is None
+
+
+def test_truncated_entry_is_a_miss(path):
+    WarmCacheSnapshot.write(path, {1: (time.time(), make_food(1, "Apple"))}, {})
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+
+    snapshot = WarmCacheSnapshot(path)
+
+    assert snapshot.get_food(1) is None
+    snapshot.close()
+
+
+def test_store_wins_over_snapshot(path, tmp_path, monkeypatch):
+    WarmCacheSnapshot.write(
+        path, {1: (time.time(), make_food(1, "Apple, from snapshot"))}, {}
+    )
+    store = LocalFoodStore(str(tmp_path / "store.json"))
+    store.upsert(make_food(1, "Apple, from store"))
+
+    monkeypatch.setattr(nutrition_tools, "API_KEY", "test-key")
+    monkeypatch.setattr(nutrition_tools, "FOOD_STORE", store)
+    monkeypatch.setattr(nutrition_tools, "SNAPSHOT", WarmCacheSnapshot(path))
+    nutrition_tools._food_cache.clear()
+
+    result = asyncio.run(nutrition_tools.get_nutrition_by_id(1))
+
+    assert "Apple, from store" in result
+    nutrition_tools.SNAPSHOT.close()
@@ -5,6 +5,8 @@ USDA FoodData Central API client
 import asyncio
 import requests
 from typing import Dict, List, Optional, Any
+from food_model import SearchHit
+from food_store import slim_food
 from utils import parse_amount_and_get_multiplier
 
 
@@ -15,7 +17,7 @@ class USDAApi:
 
     async def search_food_items(
         self, query: str, limit: int = 10
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchHit]:
         """Search for food items and return basic info"""
         url = f"{self.base_url}/foods/search"
 
@@ -43,16 +45,54 @@ class USDAApi:
         if not data.get("foods"):
             raise Exception(f"No food items found for '{query}'")
 
-        return [
-            {
-                "fdcId": food["fdcId"],
-                "description": food["description"],
-                "dataType": food["dataType"],
-                "brandOwner": food.get("brandOwner"),
-                "ingredients": food.get("ingredients"),
-            }
-            for food in data["foods"]
-        ]
+        return [SearchHit.from_dict(food) for food in data["foods"]]
+
+    async def list_foods(
+        self,
+        page_number: int = 1,
+        page_size: int = 200,
+        data_types: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """List one page of abridged food records, newest publication first"""
+        url = f"{self.base_url}/foods/list"
+
+        payload = {
+            "pageSize": page_size,
+            "pageNumber": page_number,
+            "sortBy": "publishedDate",
+            "sortOrder": "desc",
+        }
+        if data_types:
+            payload["dataType"] = data_types
+
+        params = {"api_key": self.api_key}
+
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(
+            None, lambda: requests.post(url, json=payload, params=params, timeout=30)
+        )
+
+        if not response.ok:
+            raise Exception(f"USDA API error {response.status_code}: {response.text}")
+
+        return response.json()
+
+    async def get_foods(self, fdc_ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch full food documents for up to 20 FDC IDs in one request"""
+        url = f"{self.base_url}/foods"
+
+        payload = {"fdcIds": fdc_ids, "format": "full"}
+        params = {"api_key": self.api_key}
+
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(
+            None, lambda: requests.post(url, json=payload, params=params, timeout=30)
+        )
+
+        if not response.ok:
+            raise Exception(f"USDA API error {response.status_code}: {response.text}")
+
+        return response.json()
 
     async def get_nutrition_by_id(
         self, fdc_id: int, amount: str = "100g"
@@ -69,35 +109,22 @@ class USDAApi:
         if not response.ok:
             raise Exception(f"USDA API error {response.status_code}: {response.text}")
 
-        data = response.json()
-
-        # Extract nutrients and food portions
-        nutrients = data.get("foodNutrients", [])
-        food_portions = data.get("foodPortions", [])
-
-        def get_nutrient_value(nutrient_name: str) -> float:
-            for nutrient in nutrients:
-                if (
-                    nutrient_name.lower()
-                    in nutrient.get("nutrient", {}).get("name", "").lower()
-                ):
-                    return nutrient.get("amount", 0)
-            return 0
+        data = slim_food(response.json())
 
         # Parse amount using USDA portion data
         multiplier, portion_note = parse_amount_and_get_multiplier(
-            amount, food_portions
+            amount, data.food_portions()
         )
 
         # Get base values (per 100g) and apply multiplier
         nutrition_data = {
-            "name": data.get("description", f"Food Item {fdc_id}"),
-            "calories": get_nutrient_value("Energy") * multiplier,
-            "protein": get_nutrient_value("Protein") * multiplier,
-            "carbs": get_nutrient_value("Carbohydrate") * multiplier,
-            "fat": get_nutrient_value("Total lipid") * multiplier,
-            "fiber": get_nutrient_value("Fiber") * multiplier,
-            "sugar": get_nutrient_value("Sugars") * multiplier,
+            "name": data.description or f"Food Item {fdc_id}",
+            "calories": data.nutrient_amount("Energy") * multiplier,
+            "protein": data.nutrient_amount("Protein") * multiplier,
+            "carbs": data.nutrient_amount("Carbohydrate") * multiplier,
+            "fat": data.nutrient_amount("Total lipid") * multiplier,
+            "fiber": data.nutrient_amount("Fiber") * multiplier,
+            "sugar": data.nutrient_amount("Sugars") * multiplier,
             "serving_size": amount,
             "portion_note": portion_note,
         }
@@ -112,4 +139,4 @@ class USDAApi:
         results = await self.search_food_items(ingredient, limit=1)
 
         # Get nutrition for the first result
-        return await self.get_nutrition_by_id(results[0]["fdcId"], amount)
+        return await self.get_nutrition_by_id(results[0].fdc_id, amount)
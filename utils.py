@@ -4,6 +4,7 @@ Utility functions for nutrition calculations and formatting
 
 import re
 from typing import Dict, List, Any, Tuple
+from food_model import SearchHit
 
 
 def parse_amount_and_get_multiplier(
@@ -98,23 +99,42 @@ def format_nutrition_data(data: Dict[str, Any]) -> str:
     return result
 
 
-def format_search_results(results: List[Dict[str, Any]], query: str) -> str:
+def format_search_results(
+    results: List[SearchHit],
+    query: str,
+    start: int = 1,
+    total_hits: int = None,
+    next_cursor: str = None,
+) -> str:
     """Format search results for display"""
     output = f'🔍 **Search Results for "{query}"**\n\n'
-    output += f"Found {len(results)} food items:\n\n"
-
-    for i, item in enumerate(results, 1):
-        output += f"**{i}. {item['description']}**\n"
-        output += f"   • ID: {item['fdcId']}\n"
-        output += f"   • Data Type: {item['dataType']}\n"
-        if item.get("brandOwner"):
-            output += f"   • Brand: {item['brandOwner']}\n"
+    if total_hits and (start > 1 or total_hits > len(results)):
+        output += f"Showing {start}-{start + len(results) - 1} of {total_hits} food items:\n\n"
+    else:
+        output += f"Found {len(results)} food items:\n\n"
+
+    for i, item in enumerate(results, start):
+        output += f"**{i}. {item.description}**\n"
+        output += f"   • ID: {item.fdc_id}\n"
+        output += f"   • Data Type: {item.data_type}\n"
+        if item.brand_owner:
+            output += f"   • Brand: {item.brand_owner}\n"
         output += "\n"
 
     output += "\n💡 **Next Steps:**\n"
     output += "Use the `get_nutrition_by_id` tool with one of the FDC IDs above to get detailed nutrition information.\n"
     if results:
         first_result = results[0]
-        output += f"Example: Get nutrition for ID {first_result['fdcId']} ({first_result['description'][:40]}...)"
+        output += f"Example: Get nutrition for ID {first_result.fdc_id} ({first_result.description[:40]}...)"
+    if next_cursor:
+        output += f'\nMore results available: call `search_food_items` again with cursor "{next_cursor}" to get the next page.'
 
     return output
+
+
+def format_search_page(results: List[SearchHit], start: int = 1) -> str:
+    """Compact one-line-per-item listing for streamed progress updates"""
+    return "\n".join(
+        f"{i}. {item.description} (ID: {item.fdc_id}, {item.data_type})"
+        for i, item in enumerate(results, start)
+    )
@@ -0,0 +1,117 @@
+"""
+Memory-mapped snapshot of hot foods and searches, saved at shutdown
+"""
+
+import json
+import mmap
+import os
+import time
+from typing import Dict, Optional, Any, Tuple
+
+MAGIC = b"NUTRSNAP2\n"
+
+# Entries fetched longer ago than this are ignored when the snapshot is opened
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+class WarmCacheSnapshot:
+    """
+    Read-only view over a snapshot file written by WarmCacheSnapshot.write.
+
+    Layout: MAGIC, one line of JSON index ({"foods": {id: [offset, length,
+    fetched_at]}, "searches": {key: [...]}}), then the concatenated JSON
+    entries. Opening only parses the index and drops entries older than
+    max_age; entries are decoded from the mapping on first lookup, so startup
+    cost does not grow with snapshot size.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.foods: Dict[int, Tuple[int, int, float]] = {}
+        self.searches: Dict[str, Tuple[int, int, float]] = {}
+        self._file = None
+        self._mm = None
+        self._base = 0
+
+        if not os.path.exists(path):
+            return
+        try:
+            self._file = open(path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mm[: len(MAGIC)] != MAGIC:
+                raise ValueError("not a warm cache snapshot")
+            header_end = self._mm.find(b"\n", len(MAGIC))
+            if header_end < 0:
+                raise ValueError("truncated warm cache snapshot")
+            index = json.loads(self._mm[len(MAGIC) : header_end])
+
+            cutoff = time.time() - max_age
+            self.foods = {
+                int(k): tuple(v)
+                for k, v in index.get("foods", {}).items()
+                if v[2] >= cutoff
+            }
+            self.searches = {
+                k: tuple(v)
+                for k, v in index.get("searches", {}).items()
+                if v[2] >= cutoff
+            }
+        except (OSError, ValueError, IndexError, TypeError, AttributeError):
+            # Missing, empty or corrupt snapshot: start cold
+            self.close()
+            return
+
+        self._base = header_end + 1
+
+    def get_food(self, fdc_id: int) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """(fetched_at, food dict) for a snapshot food, or None"""
+        return self._read(self.foods.get(int(fdc_id)))
+
+    def get_search(self, key: str) -> Optional[Tuple[float, Any]]:
+        """(fetched_at, search page) for a snapshot search, or None"""
+        return self._read(self.searches.get(key))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.foods = {}
+        self.searches = {}
+
+    def _read(
+        self, span: Optional[Tuple[int, int, float]]
+    ) -> Optional[Tuple[float, Any]]:
+        if span is None or self._mm is None:
+            return None
+        offset, length, fetched_at = span
+        start = self._base + offset
+        try:
+            return fetched_at, json.loads(self._mm[start : start + length])
+        except (ValueError, TypeError):
+            return None  # Entry cut short or overwritten: treat as a miss
+
+    @staticmethod
+    def write(
+        path: str,
+        foods: Dict[int, Tuple[float, Any]],
+        searches: Dict[str, Tuple[float, Any]],
+    ):
+        """Atomically write a snapshot of (fetched_at, value) foods and searches"""
+        body = bytearray()
+        index = {"foods": {}, "searches": {}}
+        for section, entries in (("foods", foods), ("searches", searches)):
+            for key, (fetched_at, value) in entries.items():
+                blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+                index[section][str(key)] = [len(body), len(blob), fetched_at]
+                body += blob
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(index, separators=(",", ":")).encode("utf-8"))
+            f.write(b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)